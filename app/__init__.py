@@ -1,6 +1,7 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from tortoise import Tortoise
 
 from app.core.exceptions import SettingNotFound
@@ -30,6 +31,7 @@ def create_app() -> FastAPI:
         description=settings.APP_DESCRIPTION,
         version=settings.VERSION,
         openapi_url="/openapi.json",
+        default_response_class=ORJSONResponse,
         middleware=make_middlewares(),
         lifespan=lifespan,
     )
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Query
 from tortoise.expressions import Q
 
 from app.controllers.api import api_controller
+from app.core.dependency import PermissionControl
 from app.schemas import Success, SuccessExtra
 from app.schemas.apis import *
 
@@ -23,7 +24,7 @@ async def list_api(
         q &= Q(summary__contains=summary)
     if tags:
         q &= Q(tags__contains=tags)
-    total, api_objs = await api_controller.list(page=page, page_size=page_size, search=q, order=["tags", "id"])
+    total, api_objs = await api_controller.list(page=page, page_size=page_size, search=q, order=("tags", "id"))
     data = [await obj.to_dict() for obj in api_objs]
     return SuccessExtra(data=data, total=total, page=page, page_size=page_size)
 
@@ -49,7 +50,8 @@ async def create_api(
 async def update_api(
     api_in: ApiUpdate,
 ):
-    await api_controller.update(id=api_in.id, obj_in=api_in)
+    await api_controller.update(id=api_in.id, obj_in=api_in, refresh=False)
+    PermissionControl.clear_cache()
     return Success(msg="Update Successfully")
 
 
@@ -58,10 +60,12 @@ async def delete_api(
     api_id: int = Query(..., description="ApiID"),
 ):
     await api_controller.remove(id=api_id)
+    PermissionControl.clear_cache()
     return Success(msg="Deleted Success")
 
 
 @router.post("/refresh", summary="刷新API列表")
 async def refresh_api():
     await api_controller.refresh_api()
+    PermissionControl.clear_cache()
     return Success(msg="OK")
@@ -48,7 +48,7 @@ async def create_menu(
 async def update_menu(
     menu_in: MenuUpdate,
 ):
-    await menu_controller.update(id=menu_in.id, obj_in=menu_in)
+    await menu_controller.update(id=menu_in.id, obj_in=menu_in, refresh=False)
     return Success(msg="Updated Success")
 
 
@@ -5,6 +5,7 @@ from fastapi.exceptions import HTTPException
 from tortoise.expressions import Q
 
 from app.controllers import role_controller
+from app.core.dependency import PermissionControl
 from app.schemas.base import Success, SuccessExtra
 from app.schemas.roles import RoleCreate, RoleUpdate, RoleUpdateMenusApis
 
@@ -47,7 +48,7 @@ async def create_role(role_in: RoleCreate):
 
 @router.post("/update", summary="更新角色")
 async def update_role(role_in: RoleUpdate):
-    await role_controller.update(id=role_in.id, obj_in=role_in)
+    await role_controller.update(id=role_in.id, obj_in=role_in, refresh=False)
     return Success(msg="Updated Successfully")
 
 
@@ -56,6 +57,7 @@ async def delete_role(
     role_id: int = Query(..., description="角色ID"),
 ):
     await role_controller.remove(id=role_id)
+    PermissionControl.clear_cache()
     return Success(msg="Deleted Success")
 
 
@@ -70,4 +72,5 @@ async def get_role_authorized(id: int = Query(..., description="角色ID")):
 async def update_role_authorized(role_in: RoleUpdateMenusApis):
     role_obj = await role_controller.get(id=role_in.id)
     await role_controller.update_roles(role=role_obj, menu_ids=role_in.menu_ids, api_infos=role_in.api_infos)
+    PermissionControl.clear_cache()
     return Success(msg="Updated Successfully")
@@ -5,6 +5,7 @@ from tortoise.expressions import Q
 
 from app.controllers.dept import dept_controller
 from app.controllers.user import user_controller
+from app.core.dependency import AuthControl, PermissionControl
 from app.schemas.base import Fail, Success, SuccessExtra
 from app.schemas.users import *
 
@@ -29,6 +30,7 @@ async def list_user(
     if dept_id is not None:
         q &= Q(dept_id=dept_id)
     total, user_objs = await user_controller.list(page=page, page_size=page_size, search=q)
+    await user_controller.model.fetch_for_list(user_objs, "roles")  # 一次性预取所有用户的角色
     data = [await obj.to_dict(m2m=True, exclude_fields=["password"]) for obj in user_objs]
     for item in data:
         dept_id = item.pop("dept_id", None)
@@ -64,6 +66,8 @@ async def update_user(
 ):
     user = await user_controller.update(id=user_in.id, obj_in=user_in)
     await user_controller.update_roles(user, user_in.role_ids)
+    AuthControl.clear_cache()
+    PermissionControl.clear_cache()
     return Success(msg="Updated Successfully")
 
 
@@ -72,6 +76,8 @@ async def delete_user(
     user_id: int = Query(..., description="用户ID"),
 ):
     await user_controller.remove(id=user_id)
+    AuthControl.clear_cache()
+    PermissionControl.clear_cache()
     return Success(msg="Deleted Successfully")
 
 
@@ -1,3 +1,5 @@
+import warnings
+
 from starlette.background import BackgroundTasks
 
 from .ctx import CTX_BG_TASKS
@@ -9,7 +11,7 @@ class BgTasks:
     """
 
     @classmethod
-    async def init_bg_tasks_obj(cls):
+    def init_bg_tasks_obj(cls):
         """
         实例化后台任务对象，并将其设置到上下文。
         作用:
@@ -20,28 +22,41 @@ class BgTasks:
         CTX_BG_TASKS.set(bg_tasks)  # 将实例设置到上下文
 
     @classmethod
-    async def get_bg_tasks_obj(cls):
+    def get_bg_tasks_obj(cls):
         """
-        从上下文中获取后台任务实例。
+        从上下文中获取后台任务实例，需要多次添加任务时可直接持有该实例，避免重复读取上下文。
         返回:
             BackgroundTasks: 后台任务实例。
         """
         return CTX_BG_TASKS.get()
 
     @classmethod
-    async def add_task(cls, func, *args, **kwargs):
+    def add(cls, func, *args, **kwargs):
         """
-        添加后台任务。
+        添加后台任务，同步方法，可在同步或异步代码中直接调用，无需 await。
         参数:
             func: 需要执行的函数。
             *args: 函数的参数。
             **kwargs: 函数的关键字参数。
         作用:
             - 将任务添加到后台任务队列中，等待执行。
+        异常:
+            RuntimeError: 当前上下文中没有后台任务实例（不在请求处理过程中）。
         """
-        bg_tasks = await cls.get_bg_tasks_obj()  # 从上下文中获取后台任务实例
+        bg_tasks = CTX_BG_TASKS.get()
+        if bg_tasks is None:
+            raise RuntimeError("BgTasks is not initialized in the current context")
         bg_tasks.add_task(func, *args, **kwargs)  # 添加任务到后台任务队列
 
+    @classmethod
+    def add_task(cls, func, *args, **kwargs):
+        """
+        添加后台任务，已弃用，请使用 add。
+        注意：该方法已改为同步方法，原有的 await BgTasks.add_task(...) 写法需去掉 await。
+        """
+        warnings.warn("BgTasks.add_task is deprecated, use BgTasks.add instead", DeprecationWarning, stacklevel=2)
+        cls.add(func, *args, **kwargs)
+
     @classmethod
     async def execute_tasks(cls):
         """
@@ -49,6 +64,6 @@ class BgTasks:
         作用:
             - 执行所有已添加到后台任务队列中的任务。
         """
-        bg_tasks = await cls.get_bg_tasks_obj()  # 从上下文中获取后台任务实例
-        if bg_tasks.tasks:  # 如果任务队列不为空
+        bg_tasks = CTX_BG_TASKS.get()  # 从上下文中获取后台任务实例
+        if bg_tasks is not None and bg_tasks.tasks:  # 如果任务队列不为空
             await bg_tasks()  # 执行所有任务
@@ -1,8 +1,24 @@
-from typing import Any, Dict, Generic, List, NewType, Tuple, Type, TypeVar, Union
+import asyncio
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    List,
+    NewType,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pydantic import BaseModel
+from tortoise import timezone
+from tortoise.exceptions import DoesNotExist
 from tortoise.expressions import Q
 from tortoise.models import Model
+from tortoise.transactions import in_transaction
 
 # 定义一个新的类型 Total，表示总数
 Total = NewType("Total", int)
@@ -37,19 +53,51 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         return await self.model.get(id=id)
 
-    async def list(self, page: int, page_size: int, search: Q = Q(), order: list = []) -> Tuple[Total, List[ModelType]]:
+    def _page_query(self, page: int, page_size: int, search: Optional[Q], order: Sequence[str]):
+        """
+        构建基础查询与分页查询。未传入过滤条件时不调用 filter，未传入排序规则时不调用 order_by。
+        返回:
+            包含基础查询和分页查询的元组。
+        """
+        query = self.model.all() if search is None else self.model.filter(search)  # 应用过滤条件
+        page_query = query.offset((page - 1) * page_size).limit(page_size)
+        if order:
+            page_query = page_query.order_by(*order)
+        return query, page_query
+
+    async def list(
+        self, page: int, page_size: int, search: Optional[Q] = None, order: Sequence[str] = ()
+    ) -> Tuple[Total, List[ModelType]]:
         """
         异步获取对象列表，支持分页、搜索和排序。
         参数:
             page: 当前页码。
             page_size: 每页的大小。
-            search: 过滤条件，使用 Q 对象表示。
-            order: 排序规则，列表形式。
+            search: 过滤条件，使用 Q 对象表示，为 None 时不过滤。
+            order: 排序规则，字段名序列。
         返回:
             Tuple[Total, List[ModelType]]: 包含总数和对象列表的元组。
         """
-        query = self.model.filter(search)  # 应用过滤条件
-        return await query.count(), await query.offset((page - 1) * page_size).limit(page_size).order_by(*order)
+        query, page_query = self._page_query(page, page_size, search, order)
+        # 并发执行计数与分页查询
+        total, objs = await asyncio.gather(query.count(), page_query)
+        return total, objs
+
+    async def list_no_count(
+        self, page: int, page_size: int, search: Optional[Q] = None, order: Sequence[str] = ()
+    ) -> List[ModelType]:
+        """
+        异步获取对象列表，不统计总数，适用于无需分页总数的场景。
+        参数:
+            page: 当前页码。
+            page_size: 每页的大小。
+            search: 过滤条件，使用 Q 对象表示，为 None 时不过滤。
+            order: 排序规则，字段名序列。
+        返回:
+            List[ModelType]: 对象列表。
+        """
+        _, page_query = self._page_query(page, page_size, search, order)
+        return await page_query
 
     async def create(self, obj_in: CreateSchemaType) -> ModelType:
         """
@@ -67,29 +115,116 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         await obj.save()  # 保存到数据库
         return obj
 
-    async def update(self, id: int, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> ModelType:
+    def _to_update_fields(self, obj_dict: Dict[str, Any], now: Any) -> Dict[str, Any]:
+        """
+        只保留可更新的数据库字段（排除主键），并补充 auto_now 字段（QuerySet.update / bulk_update 不会自动更新）。
+        参数:
+            obj_dict: 更新数据。
+            now: auto_now 字段使用的当前时间。
+        返回:
+            Dict[str, Any]: 可直接写入数据库的更新数据。
+        """
+        meta = self.model._meta
+        update_dict = {k: v for k, v in obj_dict.items() if k in meta.db_fields and k != meta.pk_attr}
+        for field_name in meta.db_fields:
+            if getattr(meta.fields_map[field_name], "auto_now", False):
+                update_dict[field_name] = now
+        return update_dict
+
+    async def create_multi(
+        self, objs_in: List[Union[CreateSchemaType, Dict[str, Any]]], batch_size: int = 500
+    ) -> List[ModelType]:
         """
-        异步更新对象。
+        异步批量创建对象，按批次合并为多行 INSERT，并在同一事务中执行。
+        参数:
+            objs_in: 创建对象的输入数据列表，元素可以是字典或 Pydantic 模型。
+            batch_size: 每条 INSERT 语句包含的最大行数。
+        返回:
+            List[ModelType]: 创建的对象列表（部分数据库不会回填自增主键）。
+        """
+        objs = [self.model(**(obj_in if isinstance(obj_in, Dict) else obj_in.model_dump())) for obj_in in objs_in]
+        async with in_transaction():
+            await self.model.bulk_create(objs, batch_size=batch_size)
+        return objs
+
+    async def update_multi(
+        self, objs_in: List[Union[UpdateSchemaType, Dict[str, Any]]], batch_size: int = 500
+    ) -> List[ModelType]:
+        """
+        异步批量更新对象，每个输入必须包含 id 字段。
+        参数:
+            objs_in: 更新对象的输入数据列表，元素可以是字典或 Pydantic 模型。
+            batch_size: 每条 UPDATE 语句包含的最大行数。
+        返回:
+            List[ModelType]: 更新后的对象列表。
+        异常:
+            DoesNotExist: 任一对象不存在，此时不会更新任何对象。
+        """
+        obj_dicts = {}
+        now = timezone.now()
+        for obj_in in objs_in:
+            if isinstance(obj_in, Dict):
+                obj_dict = dict(obj_in)
+            else:
+                obj_dict = obj_in.model_dump(exclude_unset=True)
+            obj_id = obj_dict.pop("id")
+            obj_dicts[obj_id] = self._to_update_fields(obj_dict, now)
+        fields = {field for obj_dict in obj_dicts.values() for field in obj_dict}
+        async with in_transaction():
+            objs = await self.model.filter(id__in=list(obj_dicts))
+            if len(objs) != len(obj_dicts):  # 存在找不到的对象，与 update / remove 保持一致
+                raise DoesNotExist(self.model)
+            for obj in objs:
+                obj.update_from_dict(obj_dicts[obj.id])
+            if objs and fields:
+                await self.model.bulk_update(objs, fields=list(fields), batch_size=batch_size)
+        return objs
+
+    async def delete_multi(self, ids: List[int]) -> int:
+        """
+        异步批量删除对象。
+        参数:
+            ids: 要删除的对象的唯一标识符列表。
+        返回:
+            int: 删除的行数。
+        """
+        return await self.model.filter(id__in=ids).delete()
+
+    async def update(
+        self, id: int, obj_in: Union[UpdateSchemaType, Dict[str, Any]], refresh: bool = True
+    ) -> Optional[ModelType]:
+        """
+        异步更新对象，直接按主键执行 UPDATE 语句。
         参数:
             id: 要更新的对象的唯一标识符。
             obj_in: 更新对象的输入数据，可以是字典或 Pydantic 模型。
+            refresh: 是否在更新后重新查询并返回对象。
         返回:
-            ModelType: 更新后的对象。
+            Optional[ModelType]: 更新后的对象，refresh 为 False 时返回 None。
+        异常:
+            DoesNotExist: 对象不存在。
         """
         if isinstance(obj_in, Dict):  # 如果输入是字典，直接使用
             obj_dict = obj_in
         else:  # 否则转换为字典，排除未设置的字段和 ID
             obj_dict = obj_in.model_dump(exclude_unset=True, exclude={"id"})
-        obj = await self.get(id=id)  # 获取现有对象
-        obj = obj.update_from_dict(obj_dict)  # 更新对象
-        await obj.save()  # 保存更改
-        return obj
+        obj_dict = self._to_update_fields(obj_dict, timezone.now())
+        if obj_dict:
+            updated = await self.model.filter(id=id).update(**obj_dict)
+            if not updated:
+                raise DoesNotExist(self.model)
+        elif not refresh:
+            await self.get(id=id)  # 没有需要更新的字段时，仍需校验对象是否存在
+        return await self.get(id=id) if refresh else None
 
     async def remove(self, id: int) -> None:
         """
-        异步删除对象。
+        异步删除对象，直接按主键执行 DELETE 语句。
         参数:
             id: 要删除的对象的唯一标识符。
+        异常:
+            DoesNotExist: 对象不存在。
         """
-        obj = await self.get(id=id)  # 获取对象
-        await obj.delete()  # 删除对象
+        deleted = await self.model.filter(id=id).delete()
+        if not deleted:
+            raise DoesNotExist(self.model)
@@ -1,11 +1,19 @@
+import hashlib
+import time
 from typing import Optional
 
 import jwt
 from fastapi import Depends, Header, HTTPException, Request
 
 from app.core.ctx import CTX_USER_ID
-from app.models import Role, User
+from app.models import Api, Role, User
 from app.settings import settings
+from app.utils.cache import TTLCache
+
+# Token 验证结果缓存，键为 Token 的 SHA-256 摘要，值为 (过期时间戳, 用户对象)
+_auth_cache = TTLCache(maxsize=10_000, ttl=60)
+# 用户权限缓存，键为用户 ID，值为该用户可访问的 (method, path) 集合
+_perm_cache = TTLCache(maxsize=5_000, ttl=30)
 
 
 class AuthControl:
@@ -14,10 +22,20 @@ class AuthControl:
     """
 
     @classmethod
-    async def is_authed(cls, token: str = Header(..., description="token验证")) -> Optional["User"]:
+    def clear_cache(cls) -> None:
+        """
+        清空 Token 验证缓存，在用户信息被修改或删除后调用。
+        """
+        _auth_cache.clear()
+
+    @classmethod
+    async def _is_authed_prod(
+        cls, request: Request, token: str = Header(..., description="token验证")
+    ) -> Optional["User"]:
         """
-        验证用户的 Token，并返回对应的用户对象。
+        验证用户的 Token，并返回对应的用户对象，同时存储到 request.state.current_user 中。
         参数:
+            request: 请求对象。
             token: 用户提供的 Token，通过 Header 传递。
         返回:
             User: 用户对象，如果验证成功。
@@ -25,19 +43,29 @@ class AuthControl:
             HTTPException: 如果 Token 无效、过期或其他错误，抛出 401 或 500 状态码的异常。
         """
         try:
-            if token == "dev":  # 开发模式下，直接返回第一个用户
-                user = await User.filter().first()
-                user_id = user.id
-            else:
-                # 解码 Token，获取用户 ID
-                decode_data = jwt.decode(token, settings.SECRET_KEY, algorithms=settings.JWT_ALGORITHM)
-                user_id = decode_data.get("user_id")
+            cache_key = hashlib.sha256(token.encode()).digest()
+            cached = _auth_cache.get(cache_key)
+            if cached is not None and cached[0] > time.time():  # 命中缓存且 Token 未过期
+                user = cached[1]
+                CTX_USER_ID.set(user.id)
+                request.state.current_user = user
+                return user
+
+            # 解码 Token，获取用户 ID
+            decode_data = jwt.decode(token, settings.SECRET_KEY, algorithms=settings.JWT_ALGORITHM)
+            user_id = decode_data.get("user_id")
+            exp = decode_data.get("exp")
             # 根据用户 ID 查询用户
-            user = await User.filter(id=user_id).first()
+            user = await User.filter(id=user_id).only("id", "username", "is_superuser").first()
             if not user:
                 raise HTTPException(status_code=401, detail="Authentication failed")
+            # 只缓存验证通过且带有过期时间的 Token，缓存时间不超过 Token 的剩余有效期
+            if exp is not None:
+                _auth_cache.set(cache_key, (exp, user), ttl=exp - time.time())
             # 将用户 ID 设置到上下文
             CTX_USER_ID.set(int(user_id))
+            # 将用户对象存储到请求状态，供审计日志等后续处理复用
+            request.state.current_user = user
             return user
         except jwt.DecodeError:  # Token 解码失败
             raise HTTPException(status_code=401, detail="无效的Token")
@@ -46,12 +74,45 @@ class AuthControl:
         except Exception as e:  # 其他异常
             raise HTTPException(status_code=500, detail=f"{repr(e)}")
 
+    @classmethod
+    async def _is_authed_dev(
+        cls, request: Request, token: str = Header(..., description="token验证")
+    ) -> Optional["User"]:
+        """
+        开发模式下的 Token 验证，额外支持使用 "dev" 作为 Token 直接登录第一个用户，其余 Token 按正常流程验证。
+        参数:
+            request: 请求对象。
+            token: 用户提供的 Token，通过 Header 传递。
+        返回:
+            User: 用户对象，如果验证成功。
+        异常:
+            HTTPException: 如果 Token 无效、过期或其他错误，抛出 401 或 500 状态码的异常。
+        """
+        if token != "dev":
+            return await cls._is_authed_prod(request, token)
+        user = await User.filter().first()  # 直接返回第一个用户
+        if not user:
+            raise HTTPException(status_code=401, detail="Authentication failed")
+        CTX_USER_ID.set(user.id)
+        request.state.current_user = user
+        return user
+
+    # 在加载时根据 DEBUG 选择验证函数，生产环境不包含 "dev" Token 分支
+    is_authed = _is_authed_dev if settings.DEBUG else _is_authed_prod
+
 
 class PermissionControl:
     """
     用于处理用户权限验证的逻辑。
     """
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        清空用户权限缓存，在角色、API 或用户角色绑定被修改后调用。
+        """
+        _perm_cache.clear()
+
     @classmethod
     async def has_permission(cls, request: Request, current_user: User = Depends(AuthControl.is_authed)) -> None:
         """
@@ -66,13 +127,16 @@ class PermissionControl:
             return
         method = request.method  # 请求方法
         path = request.url.path  # 请求路径
-        roles: list[Role] = await current_user.roles  # 获取用户绑定的角色
-        if not roles:  # 如果用户没有绑定角色
-            raise HTTPException(status_code=403, detail="The user is not bound to a role")
-        # 获取所有角色对应的 API 权限
-        apis = [await role.apis for role in roles]
-        # 去重，得到用户的所有权限 API
-        permission_apis = list(set((api.method, api.path) for api in sum(apis, [])))
+        permission_apis: frozenset | None = _perm_cache.get(current_user.id)
+        if permission_apis is None:
+            # 通过关联查询一次性获取用户所有角色的 API，只查询 method 和 path 两列
+            permission_apis = frozenset(
+                await Api.filter(role_apis__user_roles__id=current_user.id).distinct().values_list("method", "path")
+            )
+            # 没有任何 API 权限时，区分用户是否绑定了角色
+            if not permission_apis and not await Role.filter(user_roles__id=current_user.id).exists():
+                raise HTTPException(status_code=403, detail="The user is not bound to a role")
+            _perm_cache.set(current_user.id, permission_apis)
         # 检查当前请求是否在权限范围内
         if (method, path) not in permission_apis:
             raise HTTPException(status_code=403, detail=f"Permission denied method:{method} path:{path}")
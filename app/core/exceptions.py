@@ -1,12 +1,32 @@
+from typing import Any
+
+import orjson
 from fastapi.exceptions import (
     HTTPException,
     RequestValidationError,
     ResponseValidationError,
 )
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from tortoise.exceptions import DoesNotExist, IntegrityError
 
+# 错误响应的 JSON 模板，结构固定，只需转义 msg
+_ERROR_TEMPLATE = b'{"code":%d,"msg":%b,"data":null}'
+
+
+def _error_response(code: int, msg: Any) -> Response:
+    """
+    根据模板生成错误响应，避免构建中间字典和完整的 JSON 编码过程。
+    参数:
+        code: 状态码。
+        msg: 错误信息。
+    返回:
+        Response: JSON 响应。
+    """
+    return Response(
+        content=_ERROR_TEMPLATE % (code, orjson.dumps(msg)), media_type="application/json", status_code=code
+    )
+
 
 class SettingNotFound(Exception):
     """
@@ -16,72 +36,61 @@ class SettingNotFound(Exception):
     pass
 
 
-async def DoesNotExistHandle(req: Request, exc: DoesNotExist) -> JSONResponse:
+async def DoesNotExistHandle(req: Request, exc: DoesNotExist) -> Response:
     """
     处理 DoesNotExist 异常，返回 404 状态码和错误信息。
     参数:
         req: 请求对象。
         exc: DoesNotExist 异常实例。
     返回:
-        JSONResponse: 包含错误信息的 JSON 响应。
+        Response: 包含错误信息的 JSON 响应。
     """
-    content = dict(
-        code=404,
-        msg=f"Object has not found, exc: {exc}, query_params: {req.query_params}",
-    )
-    return JSONResponse(content=content, status_code=404)
+    return _error_response(404, f"Object has not found, exc: {exc}, query_params: {req.query_params}")
 
 
-async def IntegrityHandle(_: Request, exc: IntegrityError) -> JSONResponse:
+async def IntegrityHandle(_: Request, exc: IntegrityError) -> Response:
     """
     处理 IntegrityError 异常，返回 500 状态码和错误信息。
     参数:
         _: 请求对象（未使用）。
         exc: IntegrityError 异常实例。
     返回:
-        JSONResponse: 包含错误信息的 JSON 响应。
+        Response: 包含错误信息的 JSON 响应。
     """
-    content = dict(
-        code=500,
-        msg=f"IntegrityError，{exc}",
-    )
-    return JSONResponse(content=content, status_code=500)
+    return _error_response(500, f"IntegrityError，{exc}")
 
 
-async def HttpExcHandle(_: Request, exc: HTTPException) -> JSONResponse:
+async def HttpExcHandle(_: Request, exc: HTTPException) -> Response:
     """
     处理 HTTPException 异常，返回对应的状态码和错误信息。
     参数:
         _: 请求对象（未使用）。
         exc: HTTPException 异常实例。
     返回:
-        JSONResponse: 包含错误信息的 JSON 响应。
+        Response: 包含错误信息的 JSON 响应。
     """
-    content = dict(code=exc.status_code, msg=exc.detail, data=None)
-    return JSONResponse(content=content, status_code=exc.status_code)
+    return _error_response(exc.status_code, exc.detail)
 
 
-async def RequestValidationHandle(_: Request, exc: RequestValidationError) -> JSONResponse:
+async def RequestValidationHandle(_: Request, exc: RequestValidationError) -> Response:
     """
     处理 RequestValidationError 异常，返回 422 状态码和错误信息。
     参数:
         _: 请求对象（未使用）。
         exc: RequestValidationError 异常实例。
     返回:
-        JSONResponse: 包含错误信息的 JSON 响应。
+        Response: 包含错误信息的 JSON 响应。
     """
-    content = dict(code=422, msg=f"RequestValidationError, {exc}")
-    return JSONResponse(content=content, status_code=422)
+    return _error_response(422, f"RequestValidationError, {exc}")
 
 
-async def ResponseValidationHandle(_: Request, exc: ResponseValidationError) -> JSONResponse:
+async def ResponseValidationHandle(_: Request, exc: ResponseValidationError) -> Response:
     """
     处理 ResponseValidationError 异常，返回 500 状态码和错误信息。
     参数:
         _: 请求对象（未使用）。
         exc: ResponseValidationError 异常实例。
     返回:
-        JSONResponse: 包含错误信息的 JSON 响应。
+        Response: 包含错误信息的 JSON 响应。
     """
-    content = dict(code=500, msg=f"ResponseValidationError, {exc}")
-    return JSONResponse(content=content, status_code=500)
+    return _error_response(500, f"ResponseValidationError, {exc}")
@@ -1,19 +1,18 @@
-import json
 import re
 from datetime import datetime
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator
 
-from fastapi import FastAPI
+import orjson
 from fastapi.responses import Response
 from fastapi.routing import APIRoute
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.core.dependency import AuthControl
 from app.models.admin import AuditLog, User
 
 from .bgtask import BgTasks
+from .ctx import CTX_BG_TASKS
 
 
 class SimpleBaseMiddleware:
@@ -69,13 +68,16 @@ class BackGroundTaskMiddleware(SimpleBaseMiddleware):
         """
         初始化后台任务对象。
         """
-        await BgTasks.init_bg_tasks_obj()
+        BgTasks.init_bg_tasks_obj()
 
     async def after_request(self, request):
         """
-        执行后台任务。
+        执行后台任务，执行完成后清理上下文，避免后台任务实例泄漏到请求中创建的其他任务。
         """
-        await BgTasks.execute_tasks()
+        try:
+            await BgTasks.execute_tasks()
+        finally:
+            CTX_BG_TASKS.set(None)
 
 
 class HttpAuditLogMiddleware(BaseHTTPMiddleware):
@@ -94,6 +96,11 @@ class HttpAuditLogMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.methods = methods  # 需要记录日志的HTTP方法
         self.exclude_paths = exclude_paths  # 不需要记录日志的路径
+        self._methods_set = frozenset(methods)
+        # 将排除路径预编译为一个正则，避免每次请求逐个匹配
+        self._exclude_re = (
+            re.compile("|".join(f"(?:{path})" for path in exclude_paths), re.I) if exclude_paths else None
+        )
         self.audit_log_paths = ["/api/v1/auditlog/list"]  # 需要特殊处理的审计日志路径
         self.max_body_size = 1024 * 1024  # 1MB 响应体大小限制
 
@@ -110,12 +117,17 @@ class HttpAuditLogMiddleware(BaseHTTPMiddleware):
         for key, value in request.query_params.items():
             args[key] = value
 
-        # 获取请求体
+        # 获取请求体，超过大小限制的请求体不读取
         if request.method in ["POST", "PUT", "PATCH"]:
+            content_length = request.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+                return args
+            if len(await request.body()) > self.max_body_size:
+                return args
             try:
-                body = await request.json()
+                body = orjson.loads(await request.body())
                 args.update(body)
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 try:
                     body = await request.form()
                     args.update(body)
@@ -124,31 +136,41 @@ class HttpAuditLogMiddleware(BaseHTTPMiddleware):
 
         return args
 
-    async def get_response_body(self, request: Request, response: Response) -> Any:
+    async def get_response_body(self, request: Request, response: Response) -> tuple[Response, Any]:
         """
         获取响应体内容，并根据大小限制和路径规则处理。
+        流式响应体被完整读取后，会用已缓冲的数据重新构建一个普通响应返回给客户端。
         参数:
             request: 请求对象。
             response: 响应对象。
         返回:
-            处理后的响应体内容。
+            (需要返回给客户端的响应对象, 处理后的响应体内容)。
         """
+        too_large = {"code": 0, "msg": "Response too large to log", "data": None}
         # 检查Content-Length
         content_length = response.headers.get("content-length")
         if content_length and int(content_length) > self.max_body_size:
-            return {"code": 0, "msg": "Response too large to log", "data": None}
+            return response, too_large
 
         if hasattr(response, "body"):
             body = response.body
         else:
-            body_chunks = []
-            async for chunk in response.body_iterator:
+            buf = bytearray()
+            body_iterator = response.body_iterator
+            async for chunk in body_iterator:
                 if not isinstance(chunk, bytes):
                     chunk = chunk.encode(response.charset)
-                body_chunks.append(chunk)
-
-            response.body_iterator = self._async_iter(body_chunks)
-            body = b"".join(body_chunks)
+                buf.extend(chunk)
+                if len(buf) > self.max_body_size:
+                    # 超出大小限制，停止缓冲，已读取部分与剩余部分原样返回给客户端
+                    response.body_iterator = self._chain_iter(bytes(buf), body_iterator)
+                    return response, too_large
+
+            body = bytes(buf)
+            # 响应体已全部在内存中，直接构建普通响应，沿用原响应的状态码和响应头
+            buffered_response = Response(content=body, status_code=response.status_code)
+            buffered_response.raw_headers = response.raw_headers
+            response = buffered_response
 
         if any(request.url.path.startswith(path) for path in self.audit_log_paths):
             try:
@@ -159,11 +181,11 @@ class HttpAuditLogMiddleware(BaseHTTPMiddleware):
                     if "data" in data and isinstance(data["data"], list):
                         for item in data["data"]:
                             item.pop("response_body", None)
-                return data
+                return response, data
             except Exception:
-                return None
+                return response, None
 
-        return self.lenient_json(body)
+        return response, self.lenient_json(body)
 
     def lenient_json(self, v: Any) -> Any:
         """
@@ -175,21 +197,35 @@ class HttpAuditLogMiddleware(BaseHTTPMiddleware):
         """
         if isinstance(v, (str, bytes)):
             try:
-                return json.loads(v)
+                return orjson.loads(v)
             except (ValueError, TypeError):
                 pass
         return v
 
-    async def _async_iter(self, items: list[bytes]) -> AsyncGenerator[bytes, None]:
+    async def _chain_iter(self, head: bytes, rest: AsyncIterator[bytes]) -> AsyncGenerator[bytes, None]:
         """
-        异步迭代器，用于处理响应体的分块数据。
+        异步迭代器，先返回已读取的数据，再继续返回剩余的响应体数据。
         参数:
-            items: 字节列表。
+            head: 已读取的字节数据。
+            rest: 剩余的响应体迭代器。
         返回:
             异步生成器。
         """
-        for item in items:
-            yield item
+        yield head
+        async for chunk in rest:
+            yield chunk
+
+    def should_log(self, request: Request) -> bool:
+        """
+        判断请求是否需要记录审计日志。
+        参数:
+            request: 请求对象。
+        返回:
+            需要记录返回 True，否则返回 False。
+        """
+        if request.method not in self._methods_set:
+            return False
+        return self._exclude_re is None or self._exclude_re.search(request.url.path) is None
 
     async def get_request_log(self, request: Request, response: Response) -> dict:
         """
@@ -201,37 +237,27 @@ class HttpAuditLogMiddleware(BaseHTTPMiddleware):
             包含日志数据的字典。
         """
         data: dict = {"path": request.url.path, "status": response.status_code, "method": request.method}
-        # 路由信息
-        app: FastAPI = request.app
-        for route in app.routes:
-            if (
-                isinstance(route, APIRoute)
-                and route.path_regex.match(request.url.path)
-                and request.method in route.methods
-            ):
-                data["module"] = ",".join(route.tags)
-                data["summary"] = route.summary
-        # 获取用户信息
-        try:
-            token = request.headers.get("token")
-            user_obj = None
-            if token:
-                user_obj: User = await AuthControl.is_authed(token)
-            data["user_id"] = user_obj.id if user_obj else 0
-            data["username"] = user_obj.username if user_obj else ""
-        except Exception:
-            data["user_id"] = 0
-            data["username"] = ""
+        # 路由信息，直接读取路由阶段已匹配到的路由，无需遍历全部路由
+        route = request.scope.get("route")
+        if isinstance(route, APIRoute) and request.method in route.methods:
+            data["module"] = ",".join(route.tags)
+            data["summary"] = route.summary
+        # 获取用户信息，复用认证依赖中已验证的用户对象
+        user_obj: User | None = getattr(request.state, "current_user", None)
+        data["user_id"] = user_obj.id if user_obj else 0
+        data["username"] = user_obj.username if user_obj else ""
         return data
 
     async def before_request(self, request: Request):
         """
-        前置处理逻辑，获取请求参数并存储在 request.state 中。
+        前置处理逻辑，判断是否需要记录日志，需要时获取请求参数并存储在 request.state 中。
         参数:
             request: 请求对象。
         """
-        request_args = await self.get_request_args(request)
-        request.state.request_args = request_args  # 将请求参数存储在request.state中
+        request.state.should_log = self.should_log(request)
+        if request.state.should_log:
+            request_args = await self.get_request_args(request)
+            request.state.request_args = request_args  # 将请求参数存储在request.state中
 
     async def after_request(self, request: Request, response: Response, process_time: int):
         """
@@ -243,16 +269,13 @@ class HttpAuditLogMiddleware(BaseHTTPMiddleware):
         返回:
             响应对象。
         """
-        if request.method in self.methods:
-            for path in self.exclude_paths:
-                if re.search(path, request.url.path, re.I) is not None:
-                    return
+        if request.state.should_log:
             data: dict = await self.get_request_log(request=request, response=response)
             data["response_time"] = process_time
 
             data["request_args"] = request.state.request_args
-            data["response_body"] = await self.get_response_body(request, response)
-            await AuditLog.create(**data)  # 创建审计日志记录
+            response, data["response_body"] = await self.get_response_body(request, response)
+            BgTasks.add(AuditLog.create, **data)  # 在响应返回后创建审计日志记录
 
         return response
 
@@ -270,5 +293,4 @@ class HttpAuditLogMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
         end_time: datetime = datetime.now()
         process_time = int((end_time.timestamp() - start_time.timestamp()) * 1000)  # 计算处理时间
-        await self.after_request(request, response, process_time)
-        return response
+        return await self.after_request(request, response, process_time)
@@ -1,37 +1,58 @@
 import asyncio
 from datetime import datetime
+from typing import Any
 
 from tortoise import fields, models
 
 from app.settings import settings
 
 
+def _is_relation_fetched(relation: Any) -> bool:
+    """
+    判断关联关系是否已通过 prefetch_related / fetch_for_list 加载。
+    依赖 Tortoise 的私有属性 ReverseRelation._fetched（基于 tortoise-orm 0.23 确认），升级 ORM 时只需修改此处。
+    """
+    return getattr(relation, "_fetched", False)
+
+
 class SqlBaseModel(models.Model):
     # 定义一个大整数类型的主键字段，并为其创建索引
     id = fields.BigIntField(pk=True, index=True)
 
+    @classmethod
+    def _get_serializer_plan(cls) -> list[tuple[str, bool]]:
+        """
+        获取序列化计划：按字段定义顺序排列的 (字段名, 是否为日期时间字段) 列表，每个模型类只计算一次。
+        """
+        plan = cls.__dict__.get("_serializer_plan")
+        if plan is None:
+            meta = cls._meta
+            plan = [
+                (field, isinstance(field_obj, fields.DatetimeField))
+                for field, field_obj in meta.fields_map.items()
+                if field in meta.db_fields
+            ]
+            cls._serializer_plan = plan
+        return plan
+
     # 异步方法，将模型实例转换为字典
     async def to_dict(self, m2m: bool = False, exclude_fields: list[str] | None = None):
-        if exclude_fields is None:
-            exclude_fields = []
+        exclude = frozenset(exclude_fields) if exclude_fields else frozenset()
+        datetime_format = settings.DATETIME_FORMAT
 
         d = {}
-        # 遍历模型的数据库字段
-        for field in self._meta.db_fields:
-            if field not in exclude_fields:
+        # 按预先计算的序列化计划遍历模型的数据库字段
+        for field, is_datetime in self._get_serializer_plan():
+            if field not in exclude:
                 value = getattr(self, field)
-                # 如果字段值是日期时间类型，则格式化为字符串
-                if isinstance(value, datetime):
-                    value = value.strftime(settings.DATETIME_FORMAT)
+                # 如果是日期时间字段，则格式化为字符串
+                if is_datetime and value is not None:
+                    value = value.strftime(datetime_format)
                 d[field] = value
 
         # 如果需要处理多对多关系字段
         if m2m:
-            tasks = [
-                self.__fetch_m2m_field(field, exclude_fields)
-                for field in self._meta.m2m_fields
-                if field not in exclude_fields
-            ]
+            tasks = [self.__fetch_m2m_field(field, exclude) for field in self._meta.m2m_fields if field not in exclude]
             # 异步获取所有多对多字段的值
             results = await asyncio.gather(*tasks)
             for field, values in results:
@@ -40,22 +61,32 @@ class SqlBaseModel(models.Model):
         return d
 
     # 私有异步方法，获取多对多字段的值
-    async def __fetch_m2m_field(self, field: str, exclude_fields: list[str]):
-        # 获取所有相关对象的值
-        values = await getattr(self, field).all().values()
-        formatted_values = []
-
-        for value in values:
-            formatted_value = {}
-            for k, v in value.items():
-                if k not in exclude_fields:
-                    # 如果值是日期时间类型，则格式化为字符串
-                    if isinstance(v, datetime):
-                        formatted_value[k] = v.strftime(settings.DATETIME_FORMAT)
-                    else:
-                        formatted_value[k] = v
-            formatted_values.append(formatted_value)
-
+    # 调用方应先对多条记录执行 prefetch_related / fetch_for_list 预取多对多字段，此时直接使用已加载的对象，不再查询数据库
+    async def __fetch_m2m_field(self, field: str, exclude: frozenset[str]):
+        datetime_format = settings.DATETIME_FORMAT
+        relation = getattr(self, field)
+        if _is_relation_fetched(relation):
+            # 已预取：按关联模型的序列化计划直接格式化
+            plan = [(k, is_dt) for k, is_dt in relation.remote_model._get_serializer_plan() if k not in exclude]
+            formatted_values = []
+            for obj in relation.related_objects:
+                formatted_value = {}
+                for k, is_dt in plan:
+                    v = getattr(obj, k)
+                    formatted_value[k] = v.strftime(datetime_format) if is_dt and v is not None else v
+                formatted_values.append(formatted_value)
+            return field, formatted_values
+
+        # 未预取：获取所有相关对象的值
+        values = await relation.all().values()
+        formatted_values = [
+            {
+                k: v.strftime(datetime_format) if isinstance(v, datetime) else v
+                for k, v in value.items()
+                if k not in exclude
+            }
+            for value in values
+        ]
         return field, formatted_values
 
     class Meta:
@@ -1,9 +1,9 @@
 from typing import Any, Optional
 
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 
-class Success(JSONResponse):
+class Success(ORJSONResponse):
     def __init__(
         self,
         code: int = 200,
@@ -16,7 +16,7 @@ class Success(JSONResponse):
         super().__init__(content=content, status_code=code)
 
 
-class Fail(JSONResponse):
+class Fail(ORJSONResponse):
     def __init__(
         self,
         code: int = 400,
@@ -29,7 +29,7 @@ class Fail(JSONResponse):
         super().__init__(content=content, status_code=code)
 
 
-class SuccessExtra(JSONResponse):
+class SuccessExtra(ORJSONResponse):
     def __init__(
         self,
         code: int = 200,
@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    进程内的 TTL 缓存，条目过期后自动失效，超过容量时淘汰最早写入的条目。
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        参数:
+            maxsize: 最大条目数。
+            ttl: 默认过期时间（秒）。
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        获取缓存值，不存在或已过期时返回 default。
+        """
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expire_at, value = item
+        if expire_at <= time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        写入缓存值，ttl 不会超过默认过期时间，ttl <= 0 时不写入。
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._data.pop(key, None)
+        while len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        删除并返回缓存值。
+        """
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        """
+        清空缓存。
+        """
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)